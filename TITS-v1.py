@@ -4,7 +4,12 @@ from io import BytesIO
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
 from reportlab.lib.styles import getSampleStyleSheet
+import os
 import logging
+from tits_timetable import find_conflict_free_schedule, format_time
+from tits_analytics import CatalogAnalytics
+from tits_export import to_bytes
+from tits_snapshot import DEFAULT_SNAPSHOT_PATH, CatalogSnapshot, build_snapshot_table, open_snapshot
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -53,81 +58,120 @@ departments = [
 ]
 
 # Generate curriculum dynamically
-curriculum = {}
 course_levels = [101, 202, 303, 404, 505, 606, 707, 808, 909, 1010, 1111, 1212, 1313, 1414]
-for dept_name, dept_code in departments:
-    courses = []
-    for i, level in enumerate(course_levels):
-        course = {
-            "code": f"{dept_code}{level}",
-            "name": f"{dept_name} Course {level}",
-            "desc": f"Master {dept_name.lower()} with merit-driven rigor at level {level}.",
-            "credits": 4 if level > 101 else 3,
-            "prereq": "None" if level == 101 else f"{dept_code}{course_levels[i-1]}"
-        }
-        # Customize specific courses for key departments
-        if dept_name == "Aerospace Engineering":
-            course["name"] = [
-                "Intro to Rocket Design", "Orbital Mechanics", "Mars Colonization Engineering", "Hypersonic Flight",
-                "Spacecraft Systems Integration", "Interplanetary Mission Design", "Asteroid Mining Tech",
-                "Starship Architecture", "Interstellar Propulsion", "Galactic Navigation", "Space Combat Engineering",
-                "Cosmic Mega-Transports", "Anti-Woke Space Logistics", "Universal Expansion Tech"
-            ][i]
-            course["desc"] = [
-                "Master propulsion with raw engineering prowess.", "Navigate space with cold, hard math.",
-                "Build habitats with unyielding logic.", "Push speed limits with fearless innovation.",
-                "Engineer ships that deliver, no fluff.", "Plan missions with ruthless precision.",
-                "Extract resources with relentless grit.", "Design vessels for the bold, not the timid.",
-                "Chase FTL with unfiltered science.", "Map the galaxy with iron will.",
-                "Defend humanity with ruthless efficiency.", "Move civilizations with no handouts.",
-                "Optimize fleets, reject mediocrity.", "Conquer the cosmos with merit-driven mastery."
-            ][i]
-        elif dept_name == "Psychology for STEM":
-            course["name"] = [
-                "Intro to Scientific Psychology", "Cognitive Science Basics", "Behavioral Analysis for Engineers",
-                "Decision-Making Models", "Team Dynamics in STEM", "Stress and Resilience Tech", "Space Psychology",
-                "Anti-Woke Psych Ethics", "Neural Data Analysis", "Galactic Crew Optimization",
-                "Cognitive Enhancement Tech", "Cosmic Psych Resilience", "Anti-Woke Behavioral Engineering",
-                "Universal Psych Mastery"
-            ][i]
-            course["desc"] = [
-                "Study minds with data, not feelings.", "Decode thought with rigorous science.",
-                "Optimize humans with empirical facts.", "Predict choices with unyielding logic.",
-                "Build elite crews with merit, no fluff.", "Forge unbreakable minds with science.",
-                "Master isolation with relentless focus.", "Reason behavior, reject feelings-first dogma.",
-                "Crunch brain data with cold precision.", "Maximize team performance across stars.",
-                "Boost minds with no apologies.", "Forge minds for the cosmic frontier.",
-                "Engineer behavior with merit-driven science.", "Dominate cognition across galaxies."
-            ][i]
-        elif dept_name == "Sociology for STEM":
-            course["name"] = [
-                "Intro to Systems Sociology", "Social Structures for Engineers", "Quantitative Social Analysis",
-                "Merit-Based Social Dynamics", "Space Colony Sociology", "Anti-Woke Social Theory",
-                "Tech-Driven Social Systems", "Galactic Social Networks", "Social Optimization Models",
-                "Cosmic Social Resilience", "Anti-Woke Governance", "Universal Social Engineering",
-                "Merit-Driven Social Optimization", "Merit-Based Social Mastery"
-            ][i]
-            course["desc"] = [
-                "Study society with data, not narratives.", "Analyze groups with scientific rigor.",
-                "Crunch social data, no woke fluff.", "Optimize societies with hard results.",
-                "Build communities with unyielding logic.", "Reject collectivism with fierce reason.",
-                "Engineer societies with proven outcomes.", "Link societies across stars with efficiency.",
-                "Maximize groups with data-driven science.", "Forge societies for the cosmic frontier.",
-                "Rule with strength, no collectivist traps.", "Design societies with no excuses.",
-                "Peak social performance with science.", "Dominate social systems across galaxies."
-            ][i]
-        courses.append(course)
-    curriculum[dept_name] = courses
 
-# Create a list of all courses for the multiselect
-all_courses = []
-for dept, courses in curriculum.items():
-    for course in courses:
-        all_courses.append(f"{course['code']}: {course['name']} ({dept})")
+def generate_curriculum():
+    curriculum = {}
+    for dept_name, dept_code in departments:
+        courses = []
+        for i, level in enumerate(course_levels):
+            course = {
+                "code": f"{dept_code}{level}",
+                "name": f"{dept_name} Course {level}",
+                "desc": f"Master {dept_name.lower()} with merit-driven rigor at level {level}.",
+                "credits": 4 if level > 101 else 3,
+                "prereq": "None" if level == 101 else f"{dept_code}{course_levels[i-1]}"
+            }
+            # Customize specific courses for key departments
+            if dept_name == "Aerospace Engineering":
+                course["name"] = [
+                    "Intro to Rocket Design", "Orbital Mechanics", "Mars Colonization Engineering", "Hypersonic Flight",
+                    "Spacecraft Systems Integration", "Interplanetary Mission Design", "Asteroid Mining Tech",
+                    "Starship Architecture", "Interstellar Propulsion", "Galactic Navigation", "Space Combat Engineering",
+                    "Cosmic Mega-Transports", "Anti-Woke Space Logistics", "Universal Expansion Tech"
+                ][i]
+                course["desc"] = [
+                    "Master propulsion with raw engineering prowess.", "Navigate space with cold, hard math.",
+                    "Build habitats with unyielding logic.", "Push speed limits with fearless innovation.",
+                    "Engineer ships that deliver, no fluff.", "Plan missions with ruthless precision.",
+                    "Extract resources with relentless grit.", "Design vessels for the bold, not the timid.",
+                    "Chase FTL with unfiltered science.", "Map the galaxy with iron will.",
+                    "Defend humanity with ruthless efficiency.", "Move civilizations with no handouts.",
+                    "Optimize fleets, reject mediocrity.", "Conquer the cosmos with merit-driven mastery."
+                ][i]
+            elif dept_name == "Psychology for STEM":
+                course["name"] = [
+                    "Intro to Scientific Psychology", "Cognitive Science Basics", "Behavioral Analysis for Engineers",
+                    "Decision-Making Models", "Team Dynamics in STEM", "Stress and Resilience Tech", "Space Psychology",
+                    "Anti-Woke Psych Ethics", "Neural Data Analysis", "Galactic Crew Optimization",
+                    "Cognitive Enhancement Tech", "Cosmic Psych Resilience", "Anti-Woke Behavioral Engineering",
+                    "Universal Psych Mastery"
+                ][i]
+                course["desc"] = [
+                    "Study minds with data, not feelings.", "Decode thought with rigorous science.",
+                    "Optimize humans with empirical facts.", "Predict choices with unyielding logic.",
+                    "Build elite crews with merit, no fluff.", "Forge unbreakable minds with science.",
+                    "Master isolation with relentless focus.", "Reason behavior, reject feelings-first dogma.",
+                    "Crunch brain data with cold precision.", "Maximize team performance across stars.",
+                    "Boost minds with no apologies.", "Forge minds for the cosmic frontier.",
+                    "Engineer behavior with merit-driven science.", "Dominate cognition across galaxies."
+                ][i]
+            elif dept_name == "Sociology for STEM":
+                course["name"] = [
+                    "Intro to Systems Sociology", "Social Structures for Engineers", "Quantitative Social Analysis",
+                    "Merit-Based Social Dynamics", "Space Colony Sociology", "Anti-Woke Social Theory",
+                    "Tech-Driven Social Systems", "Galactic Social Networks", "Social Optimization Models",
+                    "Cosmic Social Resilience", "Anti-Woke Governance", "Universal Social Engineering",
+                    "Merit-Driven Social Optimization", "Merit-Based Social Mastery"
+                ][i]
+                course["desc"] = [
+                    "Study society with data, not narratives.", "Analyze groups with scientific rigor.",
+                    "Crunch social data, no woke fluff.", "Optimize societies with hard results.",
+                    "Build communities with unyielding logic.", "Reject collectivism with fierce reason.",
+                    "Engineer societies with proven outcomes.", "Link societies across stars with efficiency.",
+                    "Maximize groups with data-driven science.", "Forge societies for the cosmic frontier.",
+                    "Rule with strength, no collectivist traps.", "Design societies with no excuses.",
+                    "Peak social performance with science.", "Dominate social systems across galaxies."
+                ][i]
+            courses.append(course)
+        curriculum[dept_name] = courses
+    return curriculum
+
+# Map the precompiled catalog snapshot when one matching this script has been built
+# (python tits_snapshot.py), otherwise build the same columns and indexes in memory.
+# A rebuilt snapshot file is picked up on the next rerun.
+SNAPSHOT_PATH = os.environ.get("TITS_SNAPSHOT", DEFAULT_SNAPSHOT_PATH)
+APP_SOURCE = os.path.abspath(__file__)
+
+@st.cache_resource(max_entries=2)
+def load_catalog(snapshot_mtime):
+    if snapshot_mtime is not None:
+        try:
+            return open_snapshot(SNAPSHOT_PATH, source=APP_SOURCE)
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Ignoring catalog snapshot {SNAPSHOT_PATH}. Error: {e}")
+    return CatalogSnapshot(build_snapshot_table(generate_curriculum(), source=APP_SOURCE))
+
+catalog = load_catalog(os.path.getmtime(SNAPSHOT_PATH) if os.path.exists(SNAPSHOT_PATH) else None)
+
+# Schedule checks are cached per selection, keyed by the selected (dept, code) pairs
+@st.cache_resource(max_entries=256)
+def check_schedule(version, selected_keys):
+    return find_conflict_free_schedule({key: catalog.course_sections[key] for key in selected_keys})
+
+# Department analytics, built once per process and refreshed incrementally: when the
+# catalog version changes only the departments whose contents changed are recomputed
+@st.cache_resource
+def load_catalog_analytics():
+    return CatalogAnalytics()
+
+def current_catalog_analytics():
+    analytics = load_catalog_analytics()
+    if analytics.version != catalog.version:
+        changed = analytics.refresh_frame(catalog.frame, catalog.prereq_rows, catalog.department_versions,
+                                          catalog.version)
+        logger.info(f"Refreshed analytics for {len(changed)} changed departments")
+    return analytics
+
+def write_related_courses(row):
+    related = catalog.related(row)
+    if related:
+        st.write("**Related Courses:** " + ", ".join(
+            f"{code} ({related_dept})" for related_dept, code, _ in related))
 
 # Sidebar for navigation
 st.sidebar.header("Navigation")
-department = st.sidebar.selectbox("Select Department", list(curriculum.keys()))
+department = st.sidebar.selectbox("Select Department", catalog.departments)
 search_term = st.sidebar.text_input("Search Courses", "")
 level_filter = st.sidebar.multiselect("Filter by Course Level", ["100-200", "300-400", "500-600", "700-800", "900-1000", "1100-1200", "1300-1400"], default=["100-200", "300-400", "500-600", "700-800", "900-1000", "1100-1200", "1300-1400"])
 sort_by = st.sidebar.selectbox("Sort By", ["Code (Ascending)", "Code (Descending)", "Name (A-Z)", "Name (Z-A)"], index=0)
@@ -135,17 +179,17 @@ show_all = st.sidebar.checkbox("Show All Courses in Department", value=False)
 
 # Course picker section
 st.header("Course Picker")
-selected_course_names = st.multiselect("Choose Your Courses", all_courses, default=[f"{course['code']}: {course['name']} ({dept})" for dept, course in st.session_state.selected_courses])
-if selected_course_names:
+# Options are catalog rows labelled from the snapshot's label column; labels include
+# the department, so both EE departments resolve to their own courses
+selected_rows = [catalog.find_row(dept, course["code"]) for dept, course in st.session_state.selected_courses]
+selected_course_rows = st.multiselect("Choose Your Courses", range(catalog.num_rows),
+                                      format_func=catalog.labels.__getitem__,
+                                      default=[row for row in selected_rows if row is not None])
+if selected_course_rows:
     # Update session state with selected courses
     st.session_state.selected_courses = []
-    for course_name in selected_course_names:
-        code = course_name.split(":")[0]
-        for dept, courses in curriculum.items():
-            for course in courses:
-                if course["code"] == code:
-                    st.session_state.selected_courses.append((dept, course))
-                    break
+    for row in selected_course_rows:
+        st.session_state.selected_courses.append((catalog.value("dept", row), catalog.course(row)))
 
 # Display selected courses
 if st.session_state.selected_courses:
@@ -174,55 +218,60 @@ if st.session_state.selected_courses:
         mime="text/csv"
     )
 
-# Filter and sort courses for main display
-filtered_courses = []
-for dept, courses in curriculum.items():
-    for course in courses:
-        try:
-            course_level = int(course["code"][2:5])
-        except (ValueError, TypeError) as e:
-            logger.error(f"Invalid course code format: {course.get('code', 'Unknown')} in {dept}. Error: {e}")
-            continue
-        level_range = [(100, 200), (300, 400), (500, 600), (700, 800), (900, 1000), (1100, 1200), (1300, 1400)]
-        matches_level = any(start <= course_level <= end for start, end in level_range if f"{start}-{end}" in level_filter)
-        if matches_level and (not search_term or 
-                              search_term.lower() in course["name"].lower() or 
-                              search_term.lower() in course["code"].lower() or 
-                              search_term.lower() in course["desc"].lower()):
-            filtered_courses.append((dept, course))
+    # Check meeting times for selected courses that have sections
+    selected_keys = tuple((dept, course["code"]) for dept, course in st.session_state.selected_courses
+                          if (dept, course["code"]) in catalog.course_sections)
+    if selected_keys:
+        check = check_schedule(catalog.version, selected_keys)
+        if check.schedule is None:
+            if check.complete:
+                st.warning("Your selected courses clash: no combination of sections is free of time conflicts.")
+            else:
+                st.warning("No conflict-free combination of sections was found for your selected courses.")
+            st.dataframe(pd.DataFrame([{
+                "Course": f"{key_a[1]} ({key_a[0]})",
+                "Clashes With": f"{key_b[1]} ({key_b[0]})",
+                "Clashing Section Pairs": f"{clashing} of {total}"
+            } for key_a, key_b, clashing, total in check.clashes]))
+        else:
+            st.subheader("Conflict-Free Sections")
+            st.dataframe(pd.DataFrame([{
+                "Department": section.dept,
+                "Code": section.code,
+                "Section": section.section,
+                "Meetings": ", ".join(f"{m.day} {format_time(m.start)}-{format_time(m.end)}" for m in section.meetings)
+            } for section in check.schedule.values()]))
 
-# Sorting logic
-if sort_by == "Code (Ascending)":
-    filtered_courses.sort(key=lambda x: x[1]["code"])
-elif sort_by == "Code (Descending)":
-    filtered_courses.sort(key=lambda x: x[1]["code"], reverse=True)
-elif sort_by == "Name (A-Z)":
-    filtered_courses.sort(key=lambda x: x[1]["name"])
-elif sort_by == "Name (Z-A)":
-    filtered_courses.sort(key=lambda x: x[1]["name"], reverse=True)
+# Filter and sort courses for main display, on the catalog columns
+sort_column, sort_order = sort_by.split(" (")
+filtered_rows = catalog.filter_rows(level_filter, search_term, dept=None if search_term else department,
+                                    sort_by=sort_column, descending=sort_order in ("Descending)", "Z-A)"))
 
 # Main content
 col1, col2 = st.columns([3, 1])
 with col1:
     if search_term or not show_all:
         st.header("Filtered Results" if search_term else f"{department} - Filtered Courses")
-        if filtered_courses:
-            for dept, course in filtered_courses:
-                if search_term or dept == department:
-                    with st.expander(f"{course['code']}: {course['name']}"):
-                        st.write(f"**Department:** {dept}")
-                        st.write(f"**Description:** {course['desc']}")
-                        st.write(f"**Credits:** {course['credits']}")
-                        st.write(f"**Prerequisites:** {course['prereq']}")
+        if filtered_rows:
+            for row in filtered_rows:
+                dept, course = catalog.value("dept", row), catalog.course(row)
+                with st.expander(f"{course['code']}: {course['name']}"):
+                    st.write(f"**Department:** {dept}")
+                    st.write(f"**Description:** {course['desc']}")
+                    st.write(f"**Credits:** {course['credits']}")
+                    st.write(f"**Prerequisites:** {course['prereq']}")
+                    write_related_courses(row)
         else:
             st.write("No courses match your filters.")
     else:
         st.header(department)
-        for course in curriculum[department]:
+        for row in catalog.department_rows(department):
+            course = catalog.course(row)
             with st.expander(f"{course['code']}: {course['name']}"):
                 st.write(f"**Description:** {course['desc']}")
                 st.write(f"**Credits:** {course['credits']}")
                 st.write(f"**Prerequisites:** {course['prereq']}")
+                write_related_courses(row)
 
 # PDF Download functionality
 def create_pdf():
@@ -236,7 +285,7 @@ def create_pdf():
     elements.append(Paragraph("Anti-Woke Mission: Merit, Truth, Freedom", styles['Heading2']))
     elements.append(Spacer(1, 12))
 
-    for dept, courses in curriculum.items():
+    for dept, courses in catalog.curriculum.items():
         elements.append(Paragraph(dept, styles['Heading2']))
         data = [["Code", "Name", "Credits", "Prerequisites"]]
         for course in courses:
@@ -260,6 +309,20 @@ with col2:
             file_name="TITS_Curriculum_AntiWoke_364.pdf",
             mime="application/pdf"
         )
+    if st.button("Download Full Catalog as Parquet"):
+        st.download_button(
+            label="Download Parquet",
+            data=to_bytes(catalog.frame, "parquet"),
+            file_name="TITS_Catalog.parquet",
+            mime="application/vnd.apache.parquet"
+        )
+    if st.button("Download Full Catalog as XLSX"):
+        st.download_button(
+            label="Download XLSX",
+            data=to_bytes(catalog.frame, "xlsx"),
+            file_name="TITS_Catalog.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
 
 # Sidebar additional info
 st.sidebar.header("About TITS")
@@ -271,6 +334,19 @@ if st.sidebar.checkbox("Mission Statement"):
     like bioinformatics and space law, we prepare students to optimize humanity for a multi-galactic future.
     """)
 
+if st.sidebar.checkbox("Catalog Analytics"):
+    st.header("Catalog Analytics")
+    catalog_analytics = current_catalog_analytics()
+    st.subheader("Credits per Department and Level")
+    st.bar_chart(catalog_analytics.credits_by_dept_band)
+    st.subheader("Courses per Level")
+    st.bar_chart(catalog_analytics.courses_by_band)
+    st.subheader("Prerequisite Depth and Fan-out")
+    st.dataframe(catalog_analytics.prereq_stats)
+    st.subheader("Most Required Courses")
+    st.dataframe(catalog_analytics.most_required().rename(columns={
+        "dept": "Department", "prereq_code": "Code", "name": "Name", "required_by": "Required By"}))
+
 # Styling
 st.markdown("""
     <style>
@@ -304,7 +304,7 @@ curriculum = {
         {"code": "AC505", "name": "Exoplanet Studies", "desc": "Find worlds with hard science.", "credits": 4, "prereq": "AC303"},
         {"code": "AC606", "name": "Gravitational Waves", "desc": "Detect spacetime with relentless focus.", "credits": 4, "prereq": "AC404"},
         {"code": "AC707", "name": "Black Hole Physics", "desc": "Probe singularities with raw intellect.", "credits": 4, "prereq": "AC505"},
-        {"code": "AC808", "name": "Dark Universe Exploration", "desc": "Unveil unseen with no apologies.", "A股": 4, "prereq": "AC606"},
+        {"code": "AC808", "name": "Dark Universe Exploration", "desc": "Unveil unseen with no apologies.", "credits": 4, "prereq": "AC606"},
         {"code": "AC909", "name": "Intergalactic Travel Theory", "desc": "Cross galaxies with bold math.", "credits": 4, "prereq": "AC707"},
         {"code": "AC1010", "name": "Cosmic Origins", "desc": "Trace the bang with unfiltered logic.", "credits": 4, "prereq": "AC808"},
         {"code": "AC1111", "name": "Anti-Woke Cosmology", "desc": "Seek truth, reject myths.", "credits": 4, "prereq": "AC909"},
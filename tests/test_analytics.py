@@ -0,0 +1,69 @@
+import math
+
+from tits_analytics import CatalogAnalytics, department_aggregates
+
+
+def course(code, prereq="None", credits=4):
+    return {"code": code, "name": f"Course {code}", "desc": "Desc.", "credits": credits, "prereq": prereq}
+
+
+def chain(prefix, levels):
+    codes = [f"{prefix}{level}" for level in levels]
+    return [course(code, "None" if i == 0 else codes[i - 1], 3 if i == 0 else 4) for i, code in enumerate(codes)]
+
+
+CURRICULUM = {
+    "Aerospace": chain("AE", [101, 202, 303, 404]),
+    "Psychology": chain("PSY", [101, 202, 1010]),
+}
+
+
+def test_department_aggregates():
+    aggregates = department_aggregates("Aerospace", CURRICULUM["Aerospace"])
+    assert aggregates.credits_by_band["100-200"] == 7
+    assert aggregates.courses_by_band["300-400"] == 2
+    assert aggregates.prereq_stats["Max Depth"] == 3
+    assert aggregates.prereq_stats["Max Fan-out"] == 1
+
+
+def test_empty_department():
+    aggregates = department_aggregates("Empty", [])
+    assert aggregates.prereq_stats["Courses"] == 0
+    assert aggregates.credits_by_band.sum() == 0
+
+
+def test_refresh_recomputes_only_changed_departments():
+    analytics = CatalogAnalytics(CURRICULUM)
+    changed = {**CURRICULUM, "Psychology": chain("PSY", [101, 202]), "Empty": []}
+    assert analytics.refresh(changed) == ["Psychology", "Empty"]
+    rebuilt = CatalogAnalytics(changed)
+    assert analytics.version == rebuilt.version
+    assert analytics.credits_by_dept_band.equals(rebuilt.credits_by_dept_band)
+    assert analytics.courses_by_band.equals(rebuilt.courses_by_band)
+    assert analytics.prereq_stats.equals(rebuilt.prereq_stats)
+    assert analytics.required_by.equals(rebuilt.required_by)
+    assert analytics.refresh(changed) == []
+
+
+def test_refresh_drops_removed_departments():
+    analytics = CatalogAnalytics(CURRICULUM)
+    assert analytics.refresh({"Aerospace": CURRICULUM["Aerospace"]}) == ["Psychology"]
+    assert list(analytics.prereq_stats.index) == ["Aerospace"]
+    assert analytics.most_required()["prereq_code"].tolist() == ["AE101", "AE202", "AE303"]
+
+
+def test_prereq_outside_department_is_not_a_cycle(caplog):
+    single = department_aggregates("X", [course("XX101", "CS101")])
+    chained = department_aggregates("X", [course("XX101", "CS101"), course("XX202", "XX101")])
+    assert "cycle" not in caplog.text
+    assert single.prereq_stats["Max Depth"] == 1
+    assert chained.prereq_stats["Max Depth"] == 2
+    assert chained.prereq_stats["Cyclic Chains"] == 0
+
+
+def test_prereq_cycle_has_no_depth(caplog):
+    aggregates = department_aggregates("X", [course("XX101", "XX303"), course("XX202", "XX101"),
+                                             course("XX303", "XX202"), course("XX404", "None")])
+    assert "Prerequisite cycle detected in X: XX101, XX202, XX303" in caplog.text
+    assert math.isnan(aggregates.prereq_stats["Max Depth"])
+    assert aggregates.prereq_stats["Cyclic Chains"] == 3
@@ -0,0 +1,43 @@
+from tits_catalog import course_level, level_band, validate_catalog
+
+
+def course(code, **fields):
+    return {"code": code, "name": code, "desc": code, "credits": 3, "prereq": "None", **fields}
+
+
+def test_course_level_and_band():
+    assert course_level("PSY303") == 303
+    assert course_level("AE1010") == 1010
+    assert course_level("AE-10") is None
+    assert level_band(202) == "100-200"
+    assert level_band(1414) == "1300-1400"
+    assert level_band(None) == "Other"
+
+
+def test_sliced_level_mismatch_warns():
+    errors, warnings = validate_catalog({"Aerospace": [course("AE101"), course("AE1010")],
+                                         "Psychology": [course("PSY101")]})
+    assert errors == []
+    assert warnings == ["AE1010 in Aerospace: int(code[2:5]) gives 101 instead of level 1010",
+                        "PSY101 in Psychology: int(code[2:5]) gives None instead of level 101"]
+
+
+def test_shared_prefix_warns():
+    errors, warnings = validate_catalog({"Entrepreneurial Engineering": [course("EE101")],
+                                         "Electrical and Electronic Engineering": [course("EE101")]})
+    assert errors == []
+    assert len(warnings) == 1 and warnings[0].startswith("Course prefix EE is shared by")
+
+
+def test_invalid_sections_are_errors():
+    meeting = {"day": "Mon", "start": "09:00", "end": "10:00"}
+    errors, _ = validate_catalog({"Aerospace": [
+        course("AE101", sections=[{"section": "A", "meetings": [meeting]}, {"section": "A", "meetings": [meeting]}]),
+        course("AE202", sections=[{"meetings": [meeting]}]),
+        course("AE303", sections=[{"section": "A", "meetings": [{"day": "Mon", "start": "9am", "end": "10:00"}]}]),
+        course("AE404", sections="A"),
+    ]})
+    assert errors[0] == "AE101 in Aerospace: duplicate section A"
+    assert errors[1].startswith("AE202 in Aerospace: invalid section")
+    assert errors[2].startswith("AE303 in Aerospace: invalid section")
+    assert errors[3] == "AE404 in Aerospace: sections must be a list"
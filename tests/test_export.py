@@ -0,0 +1,54 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from io import BytesIO
+
+from tits_catalog import catalog_frame
+from tits_export import aggregate_selections, export_catalog, to_bytes
+
+CURRICULUM = {
+    "Entrepreneurial Engineering": [
+        {"code": "EE101", "name": "Startup Fundamentals", "desc": "Build.", "credits": 3, "prereq": "None"},
+        {"code": "EE202", "name": "Disruptive Innovation", "desc": "Break.", "credits": 4, "prereq": "EE101"},
+    ],
+    "Electrical and Electronic Engineering": [
+        {"code": "EE101", "name": "Circuit Fundamentals", "desc": "Wire.", "credits": 3, "prereq": "None"},
+        {"code": "EE202", "name": "Electromagnetics", "desc": "Field.", "credits": 4, "prereq": "EE101"},
+        {"code": "EE303", "name": "Signals", "desc": "Sample.", "credits": 4, "prereq": "EE202"},
+    ],
+}
+
+
+def test_batched_exports_round_trip(tmp_path):
+    frame = catalog_frame(CURRICULUM)
+    export_catalog(CURRICULUM, tmp_path, formats=["parquet", "arrow"], batch_size=2)
+    parquet = pq.ParquetFile(tmp_path / "catalog.parquet")
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.read().to_pandas().equals(frame)
+    with pa.ipc.open_file(tmp_path / "catalog.arrow") as reader:
+        assert reader.num_record_batches == 3
+        assert reader.read_all().to_pandas().equals(frame)
+    edges = pq.read_table(tmp_path / "prereq_edges.parquet").to_pandas()
+    assert edges["prereq_dept"].tolist() == ["Entrepreneurial Engineering"] + ["Electrical and Electronic Engineering"] * 2
+
+
+def test_empty_table_exports_schema_only(tmp_path):
+    export_catalog(CURRICULUM, tmp_path, formats=["parquet"])
+    selections = pq.read_table(tmp_path / "selections.parquet")
+    assert selections.num_rows == 0
+    assert selections.schema.names == ["dept", "code", "name", "credits", "selections"]
+
+
+def test_selections_aggregate_per_department():
+    selections = pd.DataFrame({"Department": ["Entrepreneurial Engineering", "Electrical and Electronic Engineering",
+                                              "Electrical and Electronic Engineering", "Unknown"],
+                               "Code": ["EE101", "EE101", "EE101", "ZZ101"]})
+    aggregated = aggregate_selections(catalog_frame(CURRICULUM), selections)
+    assert aggregated[["dept", "selections"]].values.tolist() == [
+        ["Electrical and Electronic Engineering", 2], ["Entrepreneurial Engineering", 1]]
+
+
+def test_to_bytes_formats():
+    frame = catalog_frame(CURRICULUM)
+    assert pq.read_table(pa.BufferReader(to_bytes(frame, "parquet"))).num_rows == 5
+    assert pd.read_excel(BytesIO(to_bytes(frame, "xlsx")))["code"].tolist() == frame["code"].tolist()
@@ -0,0 +1,65 @@
+import numpy as np
+
+from tits_similarity import build_similarity_index, build_tfidf_matrix, tokenize, top_k_neighbors
+
+CURRICULUM = {
+    "Aerospace Engineering": [
+        {"code": f"AE{level}", "name": name, "desc": desc}
+        for level, (name, desc) in zip([101, 202, 303, 404, 505], [
+            ("Flight Mechanics", "Lift, drag and flight stability of aircraft."),
+            ("Propulsion Systems", "Jet and rocket propulsion for aircraft."),
+            ("Orbital Mechanics", "Orbits, transfers and rocket trajectories."),
+            ("Aircraft Structures", "Loads on aircraft wings and fuselages."),
+            ("Avionics", "Navigation and flight control electronics."),
+        ])
+    ],
+    "Biology": [
+        {"code": f"BIO{level}", "name": name, "desc": desc}
+        for level, (name, desc) in zip([101, 202, 303], [
+            ("Cell Biology", "Cells, membranes and cell division."),
+            ("Genetics", "Inheritance, genes and cell division."),
+            ("Ecology", "Populations and ecosystems."),
+        ])
+    ],
+}
+
+
+def test_tokenize_drops_stop_words_and_numbers():
+    assert tokenize("Intro to Course 303 at level 303: Rocket-Science 2.0") == ["rocket", "science"]
+
+
+def test_blocked_neighbors_match_brute_force():
+    _, _, matrix = build_tfidf_matrix(CURRICULUM)
+    # Block size that does not divide the course count
+    neighbors, scores = top_k_neighbors(matrix, k=3, block_size=3)
+    dense = (matrix @ matrix.T).toarray()
+    np.fill_diagonal(dense, 0)
+    for row in range(matrix.shape[0]):
+        expected = np.sort(dense[row][dense[row] > 0])[::-1][:3]
+        found = scores[row][neighbors[row] >= 0]
+        np.testing.assert_allclose(found, expected, rtol=1e-5)
+        for neighbor, score in zip(neighbors[row], scores[row]):
+            if neighbor >= 0:
+                assert np.isclose(dense[row, neighbor], score, rtol=1e-5)
+
+
+def test_never_its_own_neighbor():
+    _, _, matrix = build_tfidf_matrix(CURRICULUM)
+    neighbors, _ = top_k_neighbors(matrix, k=7, block_size=2)
+    assert not (neighbors == np.arange(matrix.shape[0])[:, None]).any()
+
+
+def test_padding_when_few_courses_share_a_term():
+    index = build_similarity_index(CURRICULUM, k=3)
+    row = index.positions[("Biology", "BIO303")]
+    assert index.neighbors[row].tolist() == [-1, -1, -1]
+    assert index.related("Biology", "BIO303") == []
+    assert [code for _, code, _ in index.related("Biology", "BIO101")] == ["BIO202"]
+
+
+def test_k_at_least_catalog_size_and_empty_catalog():
+    index = build_similarity_index(CURRICULUM, k=20)
+    assert index.neighbors.shape == (8, 7)
+    empty = build_similarity_index({}, k=5)
+    assert empty.neighbors.shape == (0, 0)
+    assert empty.related("Biology", "BIO101") == []
@@ -0,0 +1,89 @@
+import pytest
+
+from tits_analytics import CatalogAnalytics
+from tits_catalog import LEVEL_BANDS, UNBANDED, catalog_frame, course_level, level_band, load_curriculum
+from tits_snapshot import CatalogSnapshot, build_snapshot_table, open_snapshot, write_snapshot
+
+CURRICULUM = {
+    "Entrepreneurial Engineering": [
+        {"code": "EE101", "name": "Startup Fundamentals", "desc": "Build a startup.", "credits": 3, "prereq": "None"},
+        {"code": "EE202", "name": "Disruptive Innovation", "desc": "Break markets.", "credits": 4, "prereq": "EE101"},
+        {"code": "EE1010", "name": "Venture Scaling", "desc": "Grow a startup.", "credits": 4, "prereq": "EE202"},
+    ],
+    "Electrical and Electronic Engineering": [
+        {"code": "EE101", "name": "Circuit Fundamentals", "desc": "Wire circuits.", "credits": 3, "prereq": "None",
+         "sections": [{"section": "A", "meetings": [{"day": "Mon", "start": "09:00", "end": "10:00"}]}]},
+        {"code": "EE303", "name": "Signals", "desc": "Sample signals from circuits.", "credits": 4, "prereq": "EE101"},
+    ],
+}
+
+
+def reference_rows(curriculum, level_bands, search_term="", dept=None, sort_by="Code", descending=False):
+    # The per-course Python filter the app used before filtering on the snapshot columns
+    rows = []
+    row = 0
+    for course_dept, courses in curriculum.items():
+        for course in courses:
+            text = f"{course['name']} {course['code']} {course['desc']}".lower()
+            if (level_band(course_level(course["code"])) in level_bands
+                    and (not search_term or search_term.lower() in text)
+                    and (dept is None or course_dept == dept)):
+                rows.append((course["code" if sort_by == "Code" else "name"], row))
+            row += 1
+    return [row for _, row in sorted(rows, key=lambda item: item[0], reverse=descending)]
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "catalog.snapshot")
+    write_snapshot(CURRICULUM, path)
+    snapshot = open_snapshot(path)
+    assert snapshot.curriculum == CURRICULUM
+    assert snapshot.departments == list(CURRICULUM)
+    row = snapshot.find_row("Electrical and Electronic Engineering", "EE101")
+    assert row == 3
+    assert snapshot.labels[row] == "EE101: Circuit Fundamentals (Electrical and Electronic Engineering)"
+    assert ("Electrical and Electronic Engineering", "EE303") in [related[:2] for related in snapshot.related(row)]
+    assert list(snapshot.course_sections) == [("Electrical and Electronic Engineering", "EE101")]
+
+
+def test_snapshot_rejects_other_source(tmp_path):
+    source = tmp_path / "app.py"
+    source.write_text(f"curriculum = {CURRICULUM!r}\n")
+    path = str(tmp_path / "catalog.snapshot")
+    write_snapshot(load_curriculum(source), path, source=source)
+    assert open_snapshot(path, source=source).version
+    source.write_text(f"curriculum = {CURRICULUM!r}\n# edited\n")
+    with pytest.raises(ValueError, match="rebuild"):
+        open_snapshot(path, source=source)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"level_bands": LEVEL_BANDS + [UNBANDED], "dept": "Entrepreneurial Engineering"},
+    {"level_bands": LEVEL_BANDS, "search_term": "STARTUP"},
+    {"level_bands": ["100-200"], "search_term": "circuit", "sort_by": "Name", "descending": True},
+    {"level_bands": ["900-1000"]},
+])
+def test_filter_rows_matches_python_filter(kwargs):
+    snapshot = CatalogSnapshot(build_snapshot_table(CURRICULUM))
+    assert snapshot.filter_rows(**kwargs) == reference_rows(CURRICULUM, **kwargs)
+
+
+def test_frame_matches_catalog_frame():
+    snapshot = CatalogSnapshot(build_snapshot_table(CURRICULUM))
+    expected = catalog_frame(CURRICULUM)
+    assert snapshot.frame.dtypes.equals(expected.dtypes)
+    assert snapshot.frame.equals(expected)
+
+
+def test_analytics_from_snapshot_columns_match_curriculum():
+    snapshot = CatalogSnapshot(build_snapshot_table(CURRICULUM))
+    analytics = CatalogAnalytics()
+    analytics.refresh_frame(snapshot.frame, snapshot.prereq_rows, snapshot.department_versions, snapshot.version)
+    expected = CatalogAnalytics(CURRICULUM)
+    assert analytics.version == expected.version
+    assert analytics.credits_by_dept_band.equals(expected.credits_by_dept_band)
+    assert analytics.prereq_stats.equals(expected.prereq_stats)
+    assert analytics.required_by.equals(expected.required_by)
+    # Same per-department versions, so switching sources recomputes nothing
+    assert expected.refresh_frame(snapshot.frame, snapshot.prereq_rows, snapshot.department_versions,
+                                  snapshot.version) == []
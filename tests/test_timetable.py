@@ -0,0 +1,72 @@
+from tits_timetable import DAYS, find_conflict_free_schedule, find_conflicts, load_sections
+
+
+def course(code, *sections):
+    return {"code": code, "name": code, "desc": code, "credits": 4, "prereq": "None",
+            "sections": [{"section": f"{i:03d}", "meetings": meetings} for i, meetings in enumerate(sections)]}
+
+
+def block(day, hour, minutes=50):
+    return [{"day": day, "start": f"{hour:02d}:00", "end": f"{hour:02d}:{minutes:02d}"}]
+
+
+def options(*courses):
+    return load_sections({"Test": list(courses)})
+
+
+def test_feasible_selection_gets_a_conflict_free_schedule():
+    check = find_conflict_free_schedule(options(
+        course("AA101", block("Mon", 9), block("Mon", 10)),
+        course("AA202", block("Mon", 9)),
+        course("AA303", block("Mon", 9), block("Tue", 9)),
+    ))
+    assert check.complete and check.clashes == []
+    assert {key[1]: s.section for key, s in check.schedule.items()} == {"AA101": "001", "AA202": "000", "AA303": "001"}
+    assert find_conflicts(list(check.schedule.values())) == []
+
+
+def test_infeasible_selection_lists_clashing_courses():
+    check = find_conflict_free_schedule(options(
+        course("AA101", block("Mon", 9)),
+        course("AA202", [{"day": "Mon", "start": "09:30", "end": "10:30"}]),
+        course("AA303", block("Wed", 9)),
+    ))
+    assert check.schedule is None and check.complete
+    assert check.clashes == [(("Test", "AA101"), ("Test", "AA202"), 1, 1)]
+
+
+def test_pigeonhole_selection_is_rejected_without_search():
+    # 11 courses competing for the same 10 Monday slots
+    slots = [block("Mon", 8 + hour) for hour in range(10)]
+    check = find_conflict_free_schedule(options(*(course(f"AA{i}", *slots) for i in range(11))), max_nodes=1)
+    assert check.schedule is None and check.complete
+
+
+def test_more_courses_than_time_blocks_is_rejected_without_search():
+    # 20 courses spread over 18 distinct time blocks
+    blocks = [block(day, hour, 15) for day in DAYS[:3] for hour in (8, 10, 12, 14, 16, 18)]
+    courses = [course(f"AA{i}", *(blocks[(i * 7 + j) % len(blocks)] for j in range(9))) for i in range(20)]
+    check = find_conflict_free_schedule(options(*courses), max_nodes=1)
+    assert check.schedule is None and check.complete
+
+
+def test_weekday_pigeonhole_is_rejected_without_search():
+    # Every section meets Monday and Tuesday; 11 courses cannot share 10 Monday hours
+    sections = [block("Mon", 8 + a) + block("Tue", 8 + b) for a in range(10) for b in range(0, 10, 3)]
+    check = find_conflict_free_schedule(options(*(course(f"AA{i}", *sections) for i in range(11))), max_nodes=1)
+    assert check.schedule is None and check.complete
+
+
+def test_search_budget_reports_incomplete_check():
+    courses = [course(f"AA{i}", block("Mon", 8 + i)) for i in range(9)]
+    check = find_conflict_free_schedule(options(*courses), max_nodes=5)
+    assert check.schedule is None and not check.complete
+    assert check.clashes == []
+    assert find_conflict_free_schedule(options(*courses)).schedule is not None
+
+
+def test_section_without_id_is_skipped():
+    raw = course("AA101", block("Mon", 9))
+    raw["sections"].append({"meetings": block("Tue", 9)})
+    sections = load_sections({"Test": [raw]})
+    assert [s.section for s in sections[("Test", "AA101")]] == ["000"]
